@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 from pathlib import Path
 load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from uuid import uuid4
 from pathlib import Path
 import sys
@@ -22,7 +22,8 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from utils import chunker, rag_pipeline, transcript_fetcher, embedder
+# utils modules pull in langchain/chromadb/openai; they are imported lazily in the
+# handlers that need them so a plain page render does not pay that import cost.
 
 
 # ── Page config ────────────────────────────────────────────────────────────────
@@ -33,9 +34,16 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+@st.cache_data(show_spinner=False)
+def _read_css(css_path: str, mtime: float) -> str:
+    """Return the stylesheet contents; ``mtime`` keys the cache so edits are picked up."""
+    return Path(css_path).read_text(encoding="utf-8")
+
+
 def _load_css() -> None:
     css_path = Path(__file__).with_name("styles.css")
-    st.markdown(f"<style>{css_path.read_text(encoding='utf-8')}</style>", unsafe_allow_html=True)
+    css = _read_css(str(css_path), css_path.stat().st_mtime)
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 
 # ── Global CSS ─────────────────────────────────────────────────────────────────
@@ -81,16 +89,12 @@ def _sidebar() -> None:
         if videos:
             st.markdown("---")
             st.markdown("LOADED VIDEOS")
-            for v in videos:
-                st.markdown(f"""
-                <div class="video-card">
-                    <div class="video-card-icon">▶</div>
-                    <div>
-                        <div class="video-card-title">{v.get('title', 'Untitled')}</div>
-                        <div class="video-card-url">{v.get('url', '')[:45]}...</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(
+                _render_videos_html(
+                    tuple((v.get("video_id", ""), v.get("title", "Untitled"), v.get("url", "")) for v in videos)
+                ),
+                unsafe_allow_html=True,
+            )
 
         # Footer
         st.markdown("---")
@@ -105,9 +109,29 @@ def _sidebar() -> None:
         """, unsafe_allow_html=True)
 
 
+@st.cache_data(show_spinner=False)
+def _render_videos_html(videos: Tuple[Tuple[str, str, str], ...]) -> str:
+    """Build the loaded-videos card list as one HTML block (cached per video set)."""
+
+    return "".join(
+        f"""
+        <div class="video-card">
+            <div class="video-card-icon">▶</div>
+            <div>
+                <div class="video-card-title">{title}</div>
+                <div class="video-card-url">{url[:45]}...</div>
+            </div>
+        </div>
+        """
+        for _video_id, title, url in videos
+    )
+
+
 def _ingest_video(youtube_url: str) -> None:
     """Run the full ingestion pipeline with step-by-step progress UI."""
 
+    from utils import chunker, embedder, transcript_fetcher
+
     steps = [
         ("📥", "Transcribing audio via Whisper..."),
         ("✂️", "Chunking transcript with timestamp metadata..."),
@@ -211,19 +235,36 @@ def _main_area() -> None:
     if videos:
         user_input = st.chat_input("Ask a question about the video...")
         if user_input:
+            from utils import rag_pipeline
+
             st.session_state["messages"].append({"role": "user", "content": user_input})
             session_id = st.session_state["session_id"]
             with st.chat_message("assistant"):
-                with st.spinner(""):
-                    answer = rag_pipeline.ask(user_input, session_id=session_id)
-                    st.markdown(answer)
+                video_ids = [v.get("video_id", "") for v in videos]
+                answer = st.write_stream(
+                    rag_pipeline.stream(user_input, session_id=session_id, video_ids=video_ids)
+                )
             st.session_state["messages"].append({"role": "assistant", "content": answer})
             st.rerun()
     else:
         st.chat_input("Load a video first to start chatting...", disabled=True)
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_answer(question: str, session_id: str, video_ids: Tuple[str, ...]) -> str:
+    """Generate an answer, reusing the result for identical requests.
+
+    ``video_ids`` is part of the cache key so loading another video invalidates it.
+    Failures raise, and st.cache_data never caches a raised exception.
+    """
+    from utils import rag_pipeline
+
+    return rag_pipeline.generate_answer(question, session_id=session_id, video_ids=video_ids)
+
+
 def _run_summary() -> None:
+    from utils import rag_pipeline
+
     session_id = st.session_state["session_id"]
     prompt = (
         "Provide a clear, structured summary of the key ideas from all loaded videos. "
@@ -231,7 +272,15 @@ def _run_summary() -> None:
         "Include timestamp links where helpful."
     )
     with st.spinner("Generating summary..."):
-        answer = rag_pipeline.ask(prompt, session_id=session_id)
+        video_ids = tuple(v.get("video_id", "") for v in st.session_state["videos"])
+        try:
+            answer = _cached_answer(prompt, session_id, video_ids)
+            # Runs on cache hits too, so chat memory matches the displayed history.
+            rag_pipeline.record_exchange(session_id, prompt, answer)
+        except rag_pipeline.QuestionError as exc:
+            answer = str(exc)
+        except Exception as exc:
+            answer = rag_pipeline.error_message(exc)
     st.session_state["messages"].append({"role": "user", "content": "[Auto] Summarize loaded videos"})
     st.session_state["messages"].append({"role": "assistant", "content": answer})
     st.rerun()
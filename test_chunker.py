@@ -42,4 +42,19 @@ if docs:
     assert "start_time" in meta, "Missing start_time"
     assert "url" in meta, "Missing url"
     assert isinstance(meta["start_time"], int), "start_time should be int"
-    print("  All metadata keys present and correctly typed")
\ No newline at end of file
+    print("  All metadata keys present and correctly typed")
+
+# Test that the final chunk reaches the end and no overlap-only tail chunks are emitted
+print("\nVerifying no trailing overlap-only chunks...")
+last_text = next(
+    s["text"].strip() for s in reversed(transcript["segments"]) if s["text"].strip()
+)
+for label, chunks in (("default", docs), ("small", small_docs)):
+    if chunks:
+        assert chunks[-1].page_content.endswith(last_text), f"{label}: last chunk misses final segment"
+    for prev, cur in zip(chunks, chunks[1:]):
+        assert not (
+            len(cur.page_content) < len(prev.page_content)
+            and prev.page_content.endswith(cur.page_content)
+        ), f"{label}: chunk is a strict suffix of the previous chunk"
+print("  Last chunk ends with the final segment; no tail-only chunks")
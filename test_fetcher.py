@@ -8,11 +8,18 @@ print("Testing URL extraction...")
 test_urls = [
     "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
     "https://youtu.be/dQw4w9WgXcQ",
+    "https://youtu.be:443/dQw4w9WgXcQ",
     "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+    "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://music.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=&v=dQw4w9WgXcQ",
     "dQw4w9WgXcQ",
 ]
 for url in test_urls:
     vid_id = extract_video_id(url)
+    assert vid_id == "dQw4w9WgXcQ", f"Wrong ID for {url}: {vid_id}"
     print(f"  {url[:45]:<45} -> {vid_id}")
 
 # Test 2: Full transcript fetch (hits Whisper API)
@@ -31,7 +38,9 @@ print(f"  Title: {result2['title']} - returned instantly from cache")
 
 # Test 4: Bad URL error handling
 print("\nTesting error handling...")
-try:
-    extract_video_id("https://www.google.com")
-except ValueError as e:
-    print(f"  Caught expected error: {e}")
\ No newline at end of file
+for bad_url in ["https://www.google.com", "https://youtu.be/not-an-id"]:
+    try:
+        extract_video_id(bad_url)
+        raise AssertionError(f"Expected ValueError for {bad_url}")
+    except ValueError as e:
+        print(f"  Caught expected error: {e}")
\ No newline at end of file
@@ -7,6 +7,8 @@ moment in the video.
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 from typing import Any, Dict, List
 
 from langchain_core.documents import Document
@@ -45,29 +47,37 @@ def build_chunks(
     if not segments:
         return []
 
+    # Empty segments never contribute text, so drop them up front.
+    texts: List[str] = []
+    starts: List[Any] = []
+    word_counts: List[int] = []
+    for seg in segments:
+        # Strip once; the cached text is reused for counting and for the join.
+        text = (seg.get("text") or "").strip()
+        if text:
+            texts.append(text)
+            starts.append(seg.get("start", 0))
+            word_counts.append(len(text.split()))
+
+    # prefix[j] is the number of words in segments [0, j); strictly increasing.
+    prefix = [0, *accumulate(word_counts)]
+    n_segments = len(word_counts)
+
     documents: List[Document] = []
     i = 0
+    prev_end = 0
+
+    while i < n_segments:
+        # Chunk is [i, end): the shortest run reaching target_words (or the tail),
+        # always extending past the previous chunk so no chunk is overlap-only.
+        end = min(
+            bisect_left(prefix, prefix[i] + target_words, lo=max(i, prev_end) + 1),
+            n_segments,
+        )
+        prev_end = end
 
-    while i < len(segments):
-        chunk_segments: List[Dict[str, Any]] = []
-        word_count = 0
-
-        while i + len(chunk_segments) < len(segments) and word_count < target_words:
-            seg = segments[i + len(chunk_segments)]
-            text = (seg.get("text") or "").strip()
-            if not text:
-                i += 1
-                continue
-            chunk_segments.append(seg)
-            word_count += _word_count(text)
-
-        if not chunk_segments:
-            break
-
-        page_content = " ".join(
-            (s.get("text") or "").strip() for s in chunk_segments
-        ).strip()
-        start_time = int(float(chunk_segments[0].get("start", 0)))
+        page_content = " ".join(texts[i:end])
+        start_time = int(float(starts[i]))
 
         documents.append(
             Document(
@@ -81,21 +91,16 @@ def build_chunks(
             )
         )
 
-        # Advance so next chunk starts with ~overlap_words from the end of this chunk
-        overlap_count = 0
-        overlap_start = len(chunk_segments) - 1
-        while overlap_start >= 0 and overlap_count < overlap_words:
-            overlap_count += _word_count(
-                (chunk_segments[overlap_start].get("text") or "").strip()
-            )
-            overlap_start -= 1
-        overlap_start += 1
-        # Next chunk starts at this segment (global index i + overlap_start)
-        i += overlap_start if overlap_start > 0 else max(len(chunk_segments) - 1, 1)
-
-    return documents
+        if end >= n_segments:
+            break
 
+        # Next chunk starts at the latest segment that still carries ~overlap_words
+        # from the end of this chunk.
+        if overlap_words > 0:
+            next_i = bisect_right(prefix, prefix[end] - overlap_words, lo=i, hi=end) - 1
+        else:
+            next_i = end
+        # Overlap swallowed the whole chunk: step forward to guarantee progress.
+        i = next_i if next_i > i else max(end - 1, i + 1)
 
-def _word_count(text: str) -> int:
-    """Return the number of space-separated words in text."""
-    return len(text.split()) if text else 0
+    return documents
@@ -7,10 +7,14 @@ LangChain retriever for use in the RAG pipeline.
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import math
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Set
 
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
@@ -20,21 +24,49 @@ logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 CHROMA_DIR = PROJECT_ROOT / "chroma_db"
-COLLECTION_NAME = "youtube_transcripts"
-
-
+# Versioned: v2 uses deterministic chunk IDs and cosine HNSW settings. Chunks in
+# the legacy "youtube_transcripts" collection have random IDs and L2 settings,
+# so they are not reused; videos are re-indexed into v2 on their next load.
+COLLECTION_NAME = "youtube_transcripts_v2"
+
+# HNSW index settings applied when the collection is first created. OpenAI
+# embeddings are unit-normalised, so cosine is the natural distance.
+COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 32,
+}
+
+# Upper bound on texts per OpenAI embeddings request (and per index batch).
+EMBEDDING_BATCH_SIZE = 256
+
+# How many index batches (one embeddings request + one Chroma write each) run
+# concurrently. Documents are spread evenly over this many batches, so even an
+# hour-long video (~25 chunks) is embedded as several overlapping requests.
+INDEX_MAX_WORKERS = 4
+
+
+@lru_cache(maxsize=1)
 def _get_embeddings() -> OpenAIEmbeddings:
-    """Return a configured OpenAIEmbeddings instance."""
+    """Return a configured OpenAIEmbeddings instance (created once per process)."""
 
     api_key = os.getenv("OPENAI_API_KEY", "").strip()
     if not api_key:
         raise RuntimeError("Missing OPENAI_API_KEY. Add it to your .env file and restart the app.")
 
-    return OpenAIEmbeddings(model="text-embedding-3-small", api_key=api_key)
+    return OpenAIEmbeddings(
+        model="text-embedding-3-small",
+        api_key=api_key,
+        chunk_size=EMBEDDING_BATCH_SIZE,
+        timeout=30,
+        max_retries=2,
+    )
 
 
+@lru_cache(maxsize=1)
 def _get_vectorstore() -> Chroma:
-    """Create or load the persistent ChromaDB collection."""
+    """Create or load the persistent ChromaDB collection (opened once per process)."""
 
     CHROMA_DIR.mkdir(parents=True, exist_ok=True)
     embeddings = _get_embeddings()
@@ -42,14 +74,18 @@ def _get_vectorstore() -> Chroma:
         collection_name=COLLECTION_NAME,
         persist_directory=str(CHROMA_DIR),
         embedding_function=embeddings,
+        collection_metadata=COLLECTION_METADATA,
     )
 
 
 def index_documents(documents: List[Document]) -> None:
     """Embed and persist LangChain Documents into ChromaDB.
 
-    Groups documents by ``video_id`` and skips re-embedding for any video that
-    already exists in the collection.
+    Every chunk gets a deterministic ID (see ``_chunk_id``); chunks whose IDs
+    are already in the collection are skipped so they are never re-embedded,
+    and the rest are upserted. A video's previously indexed chunks that are
+    not in the new set (e.g. after it was re-transcribed) are deleted first,
+    so retrieval never sees two versions of the same transcript.
     """
 
     if not documents:
@@ -57,52 +93,115 @@ def index_documents(documents: List[Document]) -> None:
 
     vectordb = _get_vectorstore()
 
-    video_ids = {
-        str(doc.metadata.get("video_id", "")).strip()
-        for doc in documents
-        if doc.metadata.get("video_id")
-    }
-
-    if not video_ids:
-        logger.warning("No video_id metadata found on documents; indexing all without deduplication.")
-        vectordb.add_documents(documents)
-        return
+    # Collapse duplicate chunks within the batch; insertion order is preserved.
+    docs_by_id = {_chunk_id(doc): doc for doc in documents}
 
-    existing_video_ids = set()
+    existing_ids = set()
     try:
-        for vid in video_ids:
-            if not vid:
-                continue
-            result = vectordb.get(where={"video_id": vid})
-            if result and result.get("ids"):
-                existing_video_ids.add(vid)
+        existing_ids = _replace_stale_chunks(vectordb, docs_by_id)
     except Exception:
-        logger.warning("Failed to query existing documents in Chroma; indexing all.", exc_info=True)
-
-    videos_to_index = video_ids - existing_video_ids
-    if not videos_to_index:
-        logger.info("All videos in this batch are already indexed; skipping embedding.")
-        return
-
-    docs_to_add = [
-        doc for doc in documents if str(doc.metadata.get("video_id", "")).strip() in videos_to_index
-    ]
+        logger.warning("Failed to query existing chunk IDs in Chroma; indexing all.", exc_info=True)
 
+    docs_to_add = [doc for cid, doc in docs_by_id.items() if cid not in existing_ids]
     if not docs_to_add:
-        logger.info("No new documents to add after filtering by video_id.")
+        logger.info("All chunks in this batch are already indexed; skipping embedding.")
         return
 
     logger.info(
-        "Indexing %d documents for %d new video(s) into ChromaDB.",
+        "Indexing %d new chunk(s) for %d video(s) into ChromaDB.",
         len(docs_to_add),
-        len(videos_to_index),
+        len({str(doc.metadata.get("video_id", "")).strip() for doc in docs_to_add}),
     )
-    vectordb.add_documents(docs_to_add)
+    _add_in_batches(vectordb, docs_to_add)
 
 
-def get_retriever(k: int = 4):
-    """Return a LangChain retriever (k results) backed by ChromaDB."""
+def _replace_stale_chunks(vectordb: Chroma, docs_by_id: Dict[str, Document]) -> Set[str]:
+    """Delete each video's indexed chunks that are not in ``docs_by_id``.
 
-    vectordb = _get_vectorstore()
-    return vectordb.as_retriever(search_kwargs={"k": k})
+    Returns the IDs from ``docs_by_id`` that are already in the collection.
+    """
+
+    new_ids_by_video: Dict[str, Set[str]] = {}
+    for cid, doc in docs_by_id.items():
+        video_id = str(doc.metadata.get("video_id", "")).strip()
+        new_ids_by_video.setdefault(video_id, set()).add(cid)
+
+    existing_ids: Set[str] = set()
+    for video_id, new_ids in new_ids_by_video.items():
+        if video_id:
+            result = vectordb._collection.get(where={"video_id": video_id}, include=[])
+        else:
+            result = vectordb._collection.get(ids=list(new_ids), include=[])
+        indexed = set((result or {}).get("ids") or [])
+        stale = indexed - new_ids
+        if stale:
+            logger.info("Removing %d stale chunk(s) for video %s.", len(stale), video_id)
+            vectordb._collection.delete(ids=list(stale))
+        existing_ids |= indexed & new_ids
+    return existing_ids
+
+
+def _add_in_batches(vectordb: Chroma, documents: List[Document]) -> None:
+    """Add documents in batches, embedding several batches concurrently.
+
+    Each batch is one embedding request plus one Chroma write, so running them
+    on a small thread pool overlaps the OpenAI round-trips. The batch size
+    spreads the documents over INDEX_MAX_WORKERS batches, capped at
+    EMBEDDING_BATCH_SIZE. Any batch failure is re-raised once all submitted
+    batches have finished.
+    """
+
+    batch_size = min(EMBEDDING_BATCH_SIZE, max(1, math.ceil(len(documents) / INDEX_MAX_WORKERS)))
+    batches = [
+        documents[i : i + batch_size]
+        for i in range(0, len(documents), batch_size)
+    ]
+    if len(batches) <= 1:
+        for batch in batches:
+            _add_batch(vectordb, batch)
+        return
 
+    with ThreadPoolExecutor(max_workers=min(INDEX_MAX_WORKERS, len(batches))) as pool:
+        futures = [pool.submit(_add_batch, vectordb, batch) for batch in batches]
+    for future in futures:
+        future.result()
+
+
+def _add_batch(vectordb: Chroma, documents: List[Document]) -> None:
+    """Embed one batch ourselves and upsert the vectors straight into the collection.
+
+    Bypasses ``Chroma.add_documents`` so the embedding call is explicit and the
+    chunk IDs are deterministic (see ``_chunk_id``); upserting keeps a re-run
+    after a partial failure idempotent.
+    """
+
+    texts = [doc.page_content for doc in documents]
+    vectors = _get_embeddings().embed_documents(texts)
+    vectordb._collection.upsert(
+        ids=[_chunk_id(doc) for doc in documents],
+        embeddings=vectors,
+        metadatas=[doc.metadata for doc in documents],
+        documents=texts,
+    )
+
+
+def _chunk_id(doc: Document) -> str:
+    """Return a stable ID for a chunk derived from its video, start time and text."""
+
+    md = doc.metadata or {}
+    key = f"{md.get('video_id', '')}:{md.get('start_time', '')}:{doc.page_content}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def get_retriever(k: int = 4, video_ids: Optional[List[str]] = None):
+    """Return a LangChain MMR retriever (k results) backed by ChromaDB.
+
+    When ``video_ids`` is given, candidates are pre-filtered to those videos so
+    chunks from other previously indexed videos never reach the prompt.
+    """
+
+    vectordb = _get_vectorstore()
+    search_kwargs: Dict[str, Any] = {"k": k, "fetch_k": max(20, k)}
+    if video_ids:
+        search_kwargs["filter"] = {"video_id": {"$in": list(video_ids)}}
+    return vectordb.as_retriever(search_type="mmr", search_kwargs=search_kwargs)
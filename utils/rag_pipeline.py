@@ -1,6 +1,6 @@
 """LangChain LCEL RAG pipeline for multi-turn Q&A over YouTube transcripts.
 
-- Use Chroma retriever (k=4) over embedded transcript chunks
+- Use Chroma MMR retriever (k=4) over the loaded videos' transcript chunks
 - Use GPT-4o-mini to answer only from retrieved context
 - Maintain chat memory via ConversationBufferWindowMemory (k=5)
 - Format timestamp citations as clickable markdown links
@@ -11,12 +11,15 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Dict, List
+from collections import deque
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+from langchain_core.runnables import RunnableLambda, RunnableParallel
 from langchain_openai import ChatOpenAI
 
 from utils import embedder
@@ -24,70 +27,186 @@ from utils import embedder
 
 logger = logging.getLogger(__name__)
 
-# Simple in-process memory store: session_id -> list of (question, answer) tuples
-_MEMORY_STORE: Dict[str, List[tuple]] = {}
+# Read once at import; callers load .env before importing this module.
+_API_KEY = os.getenv("OPENAI_API_KEY", "").strip()
 
+# Number of past exchanges kept per session
+_HISTORY_WINDOW = 5
 
-def ask(question: str, session_id: str) -> str:
-    """Ask a question against all indexed videos and return an answer string.
+# Simple in-process memory store: session_id -> {"turns": last N (question, answer)
+# tuples, "text": those turns pre-formatted for the prompt}
+_MEMORY_STORE: Dict[str, Dict[str, Any]] = {}
+
+
+class QuestionError(ValueError):
+    """Raised by ``generate_answer`` when a question cannot be asked (empty, no API key)."""
+
+
+def ask(question: str, session_id: str, video_ids: Optional[Sequence[str]] = None) -> str:
+    """Ask a question against the indexed videos and return an answer string.
 
     Args:
         question: User question.
         session_id: Stable ID representing a user/session for chat memory.
+        video_ids: Restrict retrieval to these videos. Searches every indexed
+            video when omitted or empty.
 
     Returns:
         Answer string with markdown timestamp links.
     """
 
-    q = (question or "").strip()
-    if not q:
-        return "Please enter a question."
+    try:
+        answer = generate_answer(question, session_id, video_ids)
+    except QuestionError as exc:
+        return str(exc)
+    except Exception as exc:
+        return error_message(exc)
+    record_exchange(session_id, question, answer)
+    return answer
 
-    api_key = os.getenv("OPENAI_API_KEY", "").strip()
-    if not api_key:
-        return "Missing OPENAI_API_KEY. Add it to your .env file and restart the app."
 
-    chat_history = _get_history(session_id)
-    rag_chain = _build_rag_chain()
+def stream(
+    question: str, session_id: str, video_ids: Optional[Sequence[str]] = None
+) -> Iterator[str]:
+    """Like ``ask`` but yield the answer incrementally as the LLM produces it.
+
+    The full answer is saved to chat memory once the stream completes. On
+    failure the error message is yielded as the final chunk.
+    """
 
     try:
-        answer = rag_chain.invoke({"question": q, "chat_history": chat_history})
-        _save_history(session_id, q, answer)
-        return answer
+        rag_chain, inputs = _prepare(question, session_id, video_ids)
+    except QuestionError as exc:
+        yield str(exc)
+        return
+
+    parts: List[str] = []
+    try:
+        for token in rag_chain.stream(inputs):
+            parts.append(token)
+            yield token
     except Exception as exc:
         logger.exception("RAG pipeline failed.")
-        return f"Sorry — I ran into an error while answering that. ({type(exc).__name__}: {exc})"
+        yield error_message(exc)
+        return
+    record_exchange(session_id, question, "".join(parts))
+
+
+def generate_answer(
+    question: str, session_id: str, video_ids: Optional[Sequence[str]] = None
+) -> str:
+    """Answer a question like ``ask``, but raise on failure and leave memory untouched.
+
+    Suited to callers that cache answers: failures never come back as a
+    regular string, and the caller records the exchange itself with
+    ``record_exchange`` (including on cache hits).
+
+    Raises:
+        QuestionError: If the question is empty or OPENAI_API_KEY is missing.
+        Exception: Any error raised by retrieval or the LLM call (logged first).
+    """
+
+    rag_chain, inputs = _prepare(question, session_id, video_ids)
+    try:
+        return rag_chain.invoke(inputs)
+    except Exception:
+        logger.exception("RAG pipeline failed.")
+        raise
+
+
+def error_message(exc: BaseException) -> str:
+    """Return the user-facing message shown when answering a question failed."""
+
+    return f"Sorry — I ran into an error while answering that. ({type(exc).__name__}: {exc})"
+
+
+def record_exchange(session_id: str, question: str, answer: str) -> None:
+    """Add a question/answer exchange to the session's chat memory."""
+
+    _save_history(session_id, (question or "").strip(), answer)
+
+
+def _prepare(
+    question: str, session_id: str, video_ids: Optional[Sequence[str]]
+) -> Tuple[Any, Dict[str, str]]:
+    """Validate a question and return the RAG chain with its input dict.
+
+    Raises:
+        QuestionError: If the question is empty or OPENAI_API_KEY is missing.
+    """
+
+    q = (question or "").strip()
+    error = _check_question(q)
+    if error:
+        raise QuestionError(error)
+
+    rag_chain = _get_rag_chain(_video_key(video_ids))
+    return rag_chain, {"question": q, "chat_history": _get_history(session_id)}
+
+
+def _check_question(question: str) -> Optional[str]:
+    """Return a user-facing message if the question cannot be answered, else None."""
+
+    if not question:
+        return "Please enter a question."
+
+    if not _API_KEY:
+        return "Missing OPENAI_API_KEY. Add it to your .env file and restart the app."
+    return None
 
 
 def _get_history(session_id: str) -> str:
     """Return formatted chat history for a session as a plain string."""
 
     sid = (session_id or "").strip() or "default"
-    exchanges = _MEMORY_STORE.get(sid, [])
-    # Keep last 5 exchanges only
-    exchanges = exchanges[-5:]
-    if not exchanges:
-        return ""
-    lines: List[str] = []
-    for q, a in exchanges:
-        lines.append(f"Human: {q}")
-        lines.append(f"Assistant: {a}")
-    return "\n".join(lines)
+    memory = _MEMORY_STORE.get(sid)
+    return memory["text"] if memory else ""
 
 
 def _save_history(session_id: str, question: str, answer: str) -> None:
-    """Append a question/answer exchange to session memory."""
+    """Append a question/answer exchange to session memory (oldest evicted past the window).
+
+    The formatted history text is extended in place; it is only rebuilt from
+    the remaining turns when the window evicts the oldest exchange.
+    """
 
     sid = (session_id or "").strip() or "default"
-    if sid not in _MEMORY_STORE:
-        _MEMORY_STORE[sid] = []
-    _MEMORY_STORE[sid].append((question, answer))
+    memory = _MEMORY_STORE.setdefault(
+        sid, {"turns": deque(maxlen=_HISTORY_WINDOW), "text": ""}
+    )
+    turns: Deque[tuple] = memory["turns"]
+    evicting = len(turns) == turns.maxlen
+    turns.append((question, answer))
+
+    if evicting:
+        memory["text"] = "\n".join(_format_turn(q, a) for q, a in turns)
+    elif memory["text"]:
+        memory["text"] += "\n" + _format_turn(question, answer)
+    else:
+        memory["text"] = _format_turn(question, answer)
 
 
-def _build_rag_chain():
-    """Build the LCEL RAG chain (question + chat history → retrieval → answer)."""
+def _format_turn(question: str, answer: str) -> str:
+    """Format one exchange as ``Human: ...`` / ``Assistant: ...`` lines."""
 
-    retriever = embedder.get_retriever(k=4)
+    return f"Human: {question}\nAssistant: {answer}"
+
+
+def _video_key(video_ids: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    """Normalise a set of video IDs into a hashable, order-independent cache key."""
+
+    return tuple(sorted({str(v).strip() for v in video_ids or () if str(v).strip()}))
+
+
+@lru_cache(maxsize=8)
+def _get_rag_chain(video_ids: Tuple[str, ...] = ()):
+    """Build the LCEL RAG chain (question + chat history → retrieval → answer).
+
+    One chain is built per set of loaded videos and reused for every question
+    against that set.
+    """
+
+    retriever = embedder.get_retriever(k=4, video_ids=list(video_ids))
 
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -112,18 +231,19 @@ def _build_rag_chain():
         ]
     )
 
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    # Bounded per-request latency so a stalled call surfaces as an error
+    # instead of hanging the UI.
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, timeout=30, max_retries=2)
 
-    def retrieve_and_format(inputs: Dict[str, str]) -> str:
-        docs = retriever.invoke(inputs["question"])
-        return _format_docs(docs)
-
-    chain = (
-        RunnablePassthrough.assign(context=RunnableLambda(retrieve_and_format))
-        | prompt
-        | llm
-        | StrOutputParser()
+    # Branches run concurrently; retrieval is the only one doing I/O today, but
+    # further retrievers/rerankers can be added here as siblings.
+    inputs = RunnableParallel(
+        context=itemgetter("question") | retriever | RunnableLambda(_format_docs),
+        question=itemgetter("question"),
+        chat_history=itemgetter("chat_history"),
     )
+
+    chain = inputs | prompt | llm | StrOutputParser()
     return chain
 
 
@@ -133,21 +253,23 @@ def _format_docs(docs: List[Document]) -> str:
     if not docs:
         return "No relevant transcript chunks were retrieved."
 
-    parts: List[str] = []
-    for i, doc in enumerate(docs, start=1):
-        md = doc.metadata or {}
-        video_id = str(md.get("video_id", "")).strip()
-        video_title = str(md.get("video_title", "")).strip()
-        start_time = int(md.get("start_time", 0) or 0)
-        ts = _format_timestamp(start_time)
-        # Provide the link template directly as a hint; the model may reuse it.
-        link = f"https://www.youtube.com/watch?v={video_id}&t={start_time}"
-
-        header = f"[Chunk {i}] video_title={video_title!r} video_id={video_id!r} start_time={start_time} ({ts}) link={link}"
-        parts.append(header)
-        parts.append(doc.page_content.strip())
-
-    return "\n\n".join(parts).strip()
+    return "\n\n".join(_format_doc(i, doc) for i, doc in enumerate(docs, start=1)).strip()
+
+
+def _format_doc(i: int, doc: Document) -> str:
+    """Format one retrieved chunk as a citation header followed by its text."""
+
+    md = doc.metadata or {}
+    video_id = str(md.get("video_id", "")).strip()
+    video_title = str(md.get("video_title", "")).strip()
+    start_time = int(md.get("start_time", 0) or 0)
+    # Provide the link template directly as a hint; the model may reuse it.
+    return (
+        f"[Chunk {i}] video_title={video_title!r} video_id={video_id!r} "
+        f"start_time={start_time} ({_format_timestamp(start_time)}) "
+        f"link=https://www.youtube.com/watch?v={video_id}&t={start_time}"
+        f"\n\n{doc.page_content.strip()}"
+    )
 
 
 def _format_timestamp(total_seconds: int) -> str:
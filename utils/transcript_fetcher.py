@@ -7,15 +7,27 @@ and normalises output to timestamped segments:
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import mmap
 import os
 import re
+import shutil
+import string
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TypedDict
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict
+from urllib.parse import ParseResult, unquote_plus, urlparse
 
-from openai import OpenAI
+import httpx
+import orjson
+from openai import DefaultHttpxClient, OpenAI
 from yt_dlp import YoutubeDL
 
 logger = logging.getLogger(__name__)
@@ -25,6 +37,63 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 CACHE_DIR = PROJECT_ROOT / "cache"
 DATA_DIR = PROJECT_ROOT / "data"
 
+WHISPER_MODEL = "whisper-1"
+
+# Bump when the cached transcript layout changes; files from another schema or
+# Whisper model are treated as cache misses and re-transcribed.
+CACHE_SCHEMA = 1
+
+# Deletes every valid video-ID character; a valid ID translates to "".
+_ID_DELETE = str.maketrans("", "", string.ascii_letters + string.digits + "_-")
+_RE_SHORTS = re.compile(r"^/shorts/([A-Za-z0-9_-]{11})")
+_RE_EMBED = re.compile(r"^/embed/([A-Za-z0-9_-]{11})")
+# Recognised hosts, normalised to the key used by _URL_HANDLERS.
+_HOST_ALIASES = {
+    "youtu.be": "youtu.be",
+    "www.youtu.be": "youtu.be",
+    "youtube.com": "youtube.com",
+    "www.youtube.com": "youtube.com",
+    "m.youtube.com": "youtube.com",
+    "music.youtube.com": "youtube.com",
+}
+
+# Caps concurrent Whisper uploads across all threads (e.g. `fetch_transcripts`).
+_WHISPER_MAX_CONCURRENCY = 4
+_WHISPER_SEM = threading.BoundedSemaphore(_WHISPER_MAX_CONCURRENCY)
+
+# In-process LRU in front of the disk cache so Streamlit reruns skip the
+# read + parse for recently used transcripts.
+_MEM_CACHE_SIZE = 64
+_MEM_CACHE: "OrderedDict[str, TranscriptResult]" = OrderedDict()
+_MEM_CACHE_LOCK = threading.Lock()
+
+# Cache files larger than this are parsed from an mmap rather than read into memory.
+_MMAP_MIN_BYTES = 1_000_000
+
+# MIME types for the containers yt-dlp/ffmpeg typically produce.
+_AUDIO_CONTENT_TYPES = {
+    ".m4a": "audio/mp4",
+    ".mp4": "audio/mp4",
+    ".webm": "audio/webm",
+    ".opus": "audio/ogg",
+    ".ogg": "audio/ogg",
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+}
+
+# Audio at least this large is re-encoded to 16 kHz mono Opus before upload
+# (Whisper resamples to 16 kHz mono anyway). Requires ffmpeg; skipped without it.
+TRANSCODE_MIN_BYTES = 5 * 1024 * 1024
+
+# Long audio is split into pieces of this length (seconds) and transcribed in
+# parallel. Files smaller than CHUNK_MIN_BYTES, or any file when ffmpeg is not
+# installed, are sent to Whisper in one request.
+CHUNK_SECONDS = 600
+CHUNK_MIN_BYTES = 20 * 1024 * 1024
+
+# Upper bound on any single ffmpeg run, so a hung encoder cannot stall ingestion.
+FFMPEG_TIMEOUT_SECONDS = 600
+
 
 class TranscriptSegment(TypedDict):
     text: str
@@ -43,8 +112,21 @@ class TranscriptResult(TypedDict):
 def fetch_transcript(youtube_url: str) -> Dict[str, Any]:
     """Fetch or generate a timestamped transcript for a YouTube URL.
 
+    Synchronous wrapper around `fetch_transcript_async`; must not be called
+    from inside a running event loop (await the async version there instead).
+    """
+
+    return asyncio.run(fetch_transcript_async(youtube_url))
+
+
+async def fetch_transcript_async(youtube_url: str) -> Dict[str, Any]:
+    """Fetch or generate a timestamped transcript for a YouTube URL.
+
     Checks cache first; if missing, downloads audio via yt-dlp, transcribes
-    with the OpenAI Whisper API, then caches and returns the result.
+    with the OpenAI Whisper API, then caches and returns the result. The title
+    comes from the download's own metadata, and the blocking cache I/O,
+    yt-dlp and Whisper calls run in worker threads so several fetches can
+    overlap.
 
     Args:
         youtube_url: Any common YouTube URL format.
@@ -67,16 +149,18 @@ def fetch_transcript(youtube_url: str) -> Dict[str, Any]:
     video_id = extract_video_id(youtube_url)
     canonical_url = f"https://www.youtube.com/watch?v={video_id}"
 
-    cached = _load_cached(video_id)
+    paths = _paths_for(video_id)
+    cached = await asyncio.to_thread(_load_cached, paths)
     if cached is not None:
         return cached
 
-    title = _fetch_video_title(canonical_url)
-
     audio_path: Optional[Path] = None
     try:
-        audio_path = _download_audio(canonical_url, video_id)
-        segments = _transcribe_with_whisper(audio_path)
+        audio_path, title = await asyncio.to_thread(_download_audio, canonical_url, paths)
+        if title is None:
+            title = await asyncio.to_thread(_fetch_video_title, canonical_url)
+        audio_path = await asyncio.to_thread(_compress_audio, audio_path)
+        segments = await asyncio.to_thread(_transcribe_audio, audio_path)
         result: TranscriptResult = {
             "video_id": video_id,
             "title": title,
@@ -84,7 +168,7 @@ def fetch_transcript(youtube_url: str) -> Dict[str, Any]:
             "segments": segments,
             "source": "whisper",
         }
-        _save_cached(video_id, result)
+        await asyncio.to_thread(_save_cached, paths, result)
         return result
     except Exception as exc:
         raise RuntimeError(
@@ -98,6 +182,37 @@ def fetch_transcript(youtube_url: str) -> Dict[str, Any]:
                 logger.warning("Failed to delete temp audio file: %s", audio_path, exc_info=True)
 
 
+def fetch_transcripts(urls: List[str], max_concurrency: int = 4) -> List[Dict[str, Any]]:
+    """Fetch transcripts for several YouTube URLs using a bounded worker pool.
+
+    URLs that resolve to the same video ID share a single fetch. Concurrent
+    Whisper calls are additionally capped module-wide.
+
+    Args:
+        urls: YouTube URLs (any format accepted by `extract_video_id`).
+        max_concurrency: Maximum number of videos fetched at once. Default 4.
+
+    Returns:
+        One transcript dict per input URL, in input order.
+
+    Raises:
+        ValueError: If any URL does not contain a valid video ID.
+        RuntimeError: If any transcript fetch fails.
+    """
+
+    video_ids = [extract_video_id(u) for u in urls]
+    if not video_ids:
+        return []
+
+    futures: Dict[str, Future] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        for vid in video_ids:
+            if vid not in futures:
+                futures[vid] = pool.submit(fetch_transcript, vid)
+    return [futures[vid].result() for vid in video_ids]
+
+
+@lru_cache(maxsize=1024)
 def extract_video_id(youtube_url: str) -> str:
     """Extract a YouTube video ID from common URL formats.
 
@@ -114,7 +229,7 @@ def extract_video_id(youtube_url: str) -> str:
         raise ValueError("YouTube URL is empty.")
 
     # Allow raw video IDs.
-    if re.fullmatch(r"[A-Za-z0-9_-]{11}", value):
+    if _is_video_id(value):
         return value
 
     try:
@@ -122,35 +237,21 @@ def extract_video_id(youtube_url: str) -> str:
     except Exception as exc:
         raise ValueError(f"Invalid YouTube URL: {youtube_url}") from exc
 
-    host = (parsed.netloc or "").lower()
-    path = parsed.path or ""
-
-    # youtu.be/<id>
-    if "youtu.be" in host:
-        candidate = path.lstrip("/").split("/")[0]
-        return _validate_video_id(candidate, youtube_url)
-
-    # youtube.com/watch?v=<id>
-    if "youtube.com" in host or "m.youtube.com" in host or "www.youtube.com" in host:
-        if path == "/watch":
-            q = parse_qs(parsed.query)
-            candidate = (q.get("v") or [""])[0]
-            return _validate_video_id(candidate, youtube_url)
-
-        # youtube.com/shorts/<id>
-        m = re.match(r"^/shorts/([A-Za-z0-9_-]{11})", path)
-        if m:
-            return m.group(1)
-
-        # youtube.com/embed/<id>
-        m = re.match(r"^/embed/([A-Za-z0-9_-]{11})", path)
-        if m:
-            return m.group(1)
+    # hostname is lower-cased and drops any port or credentials (youtu.be:443).
+    key = _HOST_ALIASES.get(parsed.hostname or "")
+    if key == "youtube.com":
+        # youtube.com/<first path segment>/...
+        key = f"{key}/{(parsed.path or '').lstrip('/').split('/')[0]}"
+    handler = _URL_HANDLERS.get(key) if key else None
+    if handler is not None:
+        candidate = handler(parsed, youtube_url)
+        if candidate:
+            return candidate
 
     # Fallback: look for a v= param anywhere
-    q = parse_qs(parsed.query)
-    if "v" in q and q["v"]:
-        return _validate_video_id(q["v"][0], youtube_url)
+    v = _extract_v(parsed.query)
+    if v:
+        return _validate_video_id(v, youtube_url)
 
     raise ValueError(
         "Could not extract a video ID from the provided URL. "
@@ -158,39 +259,151 @@ def extract_video_id(youtube_url: str) -> str:
     )
 
 
+def _is_video_id(value: str) -> bool:
+    """Return True if value is exactly 11 characters from [A-Za-z0-9_-]."""
+    return len(value) == 11 and not value.translate(_ID_DELETE)
+
+
 def _validate_video_id(candidate: str, original: str) -> str:
-    if re.fullmatch(r"[A-Za-z0-9_-]{11}", candidate or ""):
+    if _is_video_id(candidate or ""):
         return candidate
     raise ValueError(f"Could not extract a valid YouTube video ID from: {original}")
 
 
-def _cache_path(video_id: str) -> Path:
-    return CACHE_DIR / f"{video_id}_transcript.json"
+def _extract_v(query: str) -> str:
+    """Return the first non-empty ``v`` query parameter (decoded), or "".
 
+    Scans the raw query instead of building a full ``parse_qs`` dict, since
+    share URLs often carry many tracking parameters.
+    """
 
-def _load_cached(video_id: str) -> Optional[TranscriptResult]:
-    path = _cache_path(video_id)
-    if not path.exists():
-        return None
+    rest = query
+    while rest:
+        part, _, rest = rest.partition("&")
+        if part.startswith("v=") and len(part) > 2:
+            return unquote_plus(part[2:])
+    return ""
+
+
+def _handle_youtu_be(parsed: ParseResult, original: str) -> Optional[str]:
+    """youtu.be/<id>"""
+    return _validate_video_id(parsed.path.lstrip("/").split("/")[0], original)
+
+
+def _handle_watch(parsed: ParseResult, original: str) -> Optional[str]:
+    """youtube.com/watch?v=<id>"""
+    return _validate_video_id(_extract_v(parsed.query), original)
+
+
+def _handle_shorts(parsed: ParseResult, original: str) -> Optional[str]:
+    """youtube.com/shorts/<id>"""
+    m = _RE_SHORTS.match(parsed.path)
+    return m.group(1) if m else None
+
+
+def _handle_embed(parsed: ParseResult, original: str) -> Optional[str]:
+    """youtube.com/embed/<id>"""
+    m = _RE_EMBED.match(parsed.path)
+    return m.group(1) if m else None
+
+
+# Normalised "host" or "host/first-path-segment" -> ID extractor.
+_URL_HANDLERS: Dict[str, Callable[[ParseResult, str], Optional[str]]] = {
+    "youtu.be": _handle_youtu_be,
+    "youtube.com/watch": _handle_watch,
+    "youtube.com/shorts": _handle_shorts,
+    "youtube.com/embed": _handle_embed,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class _Paths:
+    """Per-video filesystem locations, computed once per fetch."""
+
+    video_id: str
+    cache: Path
+    audio_tmpl: str
+
+
+def _paths_for(video_id: str) -> _Paths:
+    return _Paths(
+        video_id=video_id,
+        cache=CACHE_DIR / f"{video_id}_transcript.json",
+        audio_tmpl=str(DATA_DIR / f"{video_id}.%(ext)s"),
+    )
+
+
+def _load_cached(paths: _Paths) -> Optional[TranscriptResult]:
+    video_id = paths.video_id
+    with _MEM_CACHE_LOCK:
+        if video_id in _MEM_CACHE:
+            _MEM_CACHE.move_to_end(video_id)
+            return _MEM_CACHE[video_id]
+
+    path = paths.cache
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size > _MMAP_MIN_BYTES:
+                # Parse straight from the page cache instead of first copying a
+                # multi-MB file into a bytes object.
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    data = orjson.loads(view)
+            else:
+                data = orjson.loads(f.read())
         if not isinstance(data, dict) or "segments" not in data:
             return None
+        # Files written before versioning carry neither field; their layout is
+        # schema 1 from whisper-1, so they stay valid.
+        schema = data.pop("schema", 1)
+        model = data.pop("model", "whisper-1")
+        if schema != CACHE_SCHEMA or model != WHISPER_MODEL:
+            logger.debug(
+                "Ignoring stale cache file %s (schema=%s, model=%s; want schema=%s, model=%s).",
+                path, schema, model, CACHE_SCHEMA, WHISPER_MODEL,
+            )
+            return None
+        _remember(video_id, data)  # type: ignore[arg-type]
         return data  # type: ignore[return-value]
-    except Exception:
+    except FileNotFoundError:
+        return None
+    except orjson.JSONDecodeError:
         logger.warning("Failed to read cache file: %s", path, exc_info=True)
         return None
 
 
-def _save_cached(video_id: str, payload: TranscriptResult) -> None:
-    path = _cache_path(video_id)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+def _save_cached(paths: _Paths, payload: TranscriptResult) -> None:
+    path = paths.cache
+    # Write to a uniquely named sibling temp file and atomically swap it in, so
+    # an interrupted write never leaves a truncated cache file behind and two
+    # sessions saving the same video never share a temp file.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps({"schema": CACHE_SCHEMA, "model": WHISPER_MODEL, **payload}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    _remember(paths.video_id, payload)
+
+
+def _remember(video_id: str, payload: TranscriptResult) -> None:
+    """Store a transcript in the in-memory LRU, evicting the oldest past the limit."""
+
+    with _MEM_CACHE_LOCK:
+        _MEM_CACHE[video_id] = payload
+        _MEM_CACHE.move_to_end(video_id)
+        while len(_MEM_CACHE) > _MEM_CACHE_SIZE:
+            _MEM_CACHE.popitem(last=False)
 
 
 def _fetch_video_title(canonical_url: str) -> str:
-    """Fetch video metadata (title) via yt-dlp in metadata-only mode."""
+    """Fetch video metadata (title) via yt-dlp in metadata-only mode.
+
+    Only used as a fallback when the download's metadata carried no title.
+    """
 
     ydl_opts: Dict[str, Any] = {
         "quiet": True,
@@ -208,17 +421,25 @@ def _fetch_video_title(canonical_url: str) -> str:
         return "Untitled video"
 
 
-def _download_audio(canonical_url: str, video_id: str) -> Path:
+def _download_audio(canonical_url: str, paths: _Paths) -> Tuple[Path, Optional[str]]:
     """Download audio-only media to the data folder using yt-dlp.
 
-    We avoid requiring ffmpeg by downloading the best audio format directly.
-    The Whisper API supports many containers including m4a and webm.
+    Picks the audio-only stream closest to 48 kbps (preferring Opus, with a
+    32 kbps floor when one exists) and keeps its native container, so ffmpeg
+    is still not required. The Whisper API accepts m4a and webm directly.
+
+    Returns the downloaded file path and the video title from the same
+    extraction (None if yt-dlp did not report one), so no separate metadata
+    request is needed.
     """
 
-    outtmpl = str(DATA_DIR / f"{video_id}.%(ext)s")
     ydl_opts: Dict[str, Any] = {
-        "format": "bestaudio/best",
-        "outtmpl": outtmpl,
+        # Whisper only needs speech-quality audio: with this sort order "best"
+        # means the audio stream closest to 48 kbps (Opus preferred), and the
+        # bitrate floor keeps unusably low-quality streams out.
+        "format": "bestaudio[abr>=32]/bestaudio/best",
+        "format_sort": ["abr~48", "acodec:opus"],
+        "outtmpl": paths.audio_tmpl,
         "quiet": True,
         "no_warnings": True,
         "noplaylist": True,
@@ -230,49 +451,161 @@ def _download_audio(canonical_url: str, video_id: str) -> Path:
     path = Path(filename)
     if not path.exists():
         raise RuntimeError("Audio download succeeded but the file was not found on disk.")
-    return path
 
+    title = (info or {}).get("title")
+    return path, title if isinstance(title, str) and title.strip() else None
 
-def _transcribe_with_whisper(audio_path: Path) -> List[TranscriptSegment]:
-    """Transcribe audio via OpenAI Whisper API and return normalised segments.
 
-    Uses `response_format="verbose_json"` so we can preserve timestamps.
-    """
+@lru_cache(maxsize=1)
+def _get_openai_client() -> OpenAI:
+    """Return a process-wide OpenAI client so its keep-alive connection pool is reused."""
 
     api_key = os.getenv("OPENAI_API_KEY", "").strip()
     if not api_key:
         raise RuntimeError("Missing OPENAI_API_KEY. Add it to your .env file and restart the app.")
 
-    client = OpenAI(api_key=api_key)
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30)
+    )
+    return OpenAI(api_key=api_key, http_client=http_client, max_retries=2)
+
+
+def _compress_audio(audio_path: Path) -> Path:
+    """Re-encode audio to 16 kHz mono Opus to shrink the Whisper upload.
+
+    Returns the compressed file (the original is deleted), or the original
+    path unchanged if the file is small, ffmpeg is missing or encoding fails.
+    """
+
+    if audio_path.stat().st_size < TRANSCODE_MIN_BYTES or shutil.which("ffmpeg") is None:
+        return audio_path
+
+    compressed = audio_path.with_name(f"{audio_path.stem}_16k.ogg")
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+                "-i", str(audio_path),
+                "-vn", "-ac", "1", "-ar", "16000",
+                "-c:a", "libopus", "-b:a", "24k",
+                str(compressed),
+            ],
+            check=True,
+            timeout=FFMPEG_TIMEOUT_SECONDS,
+        )
+    except Exception:
+        logger.warning("Failed to transcode audio; uploading original: %s", audio_path, exc_info=True)
+        compressed.unlink(missing_ok=True)
+        return audio_path
+
+    audio_path.unlink(missing_ok=True)
+    return compressed
+
 
-    with audio_path.open("rb") as f:
+def _transcribe_audio(audio_path: Path) -> List[TranscriptSegment]:
+    """Transcribe an audio file, splitting long files into parallel Whisper calls.
+
+    Chunked results are shifted by each piece's start offset and concatenated
+    in order, so timestamps stay relative to the full video.
+    """
+
+    if (
+        not CHUNK_SECONDS
+        or audio_path.stat().st_size < CHUNK_MIN_BYTES
+        or shutil.which("ffmpeg") is None
+    ):
+        return _transcribe_with_whisper(audio_path)
+
+    parts_dir = audio_path.with_name(f"{audio_path.stem}_parts")
+    try:
+        try:
+            parts = _split_audio(audio_path, parts_dir)
+        except Exception:
+            logger.warning("Failed to split audio; uploading as one file: %s", audio_path, exc_info=True)
+            parts = []
+        if len(parts) <= 1:
+            return _transcribe_with_whisper(audio_path)
+
+        with ThreadPoolExecutor(max_workers=_WHISPER_MAX_CONCURRENCY) as pool:
+            results = list(pool.map(_transcribe_with_whisper, (path for path, _ in parts)))
+
+        segments: List[TranscriptSegment] = []
+        for (_, offset), part_segments in zip(parts, results):
+            for seg in part_segments:
+                seg["start"] += offset
+                segments.append(seg)
+        return segments
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+
+def _split_audio(audio_path: Path, parts_dir: Path) -> List[tuple]:
+    """Split audio into ~CHUNK_SECONDS pieces with ffmpeg (stream copy, no re-encode).
+
+    Returns ``(path, start_offset_seconds)`` tuples in playback order. Offsets
+    come from ffmpeg's segment list because stream-copy cuts land on packet
+    boundaries rather than exactly every CHUNK_SECONDS.
+    """
+
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    list_path = parts_dir / "parts.csv"
+    subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+            "-i", str(audio_path),
+            "-f", "segment",
+            "-segment_time", str(CHUNK_SECONDS),
+            "-segment_list", str(list_path),
+            "-segment_list_type", "csv",
+            "-c", "copy",
+            str(parts_dir / f"part_%03d{audio_path.suffix}"),
+        ],
+        check=True,
+        timeout=FFMPEG_TIMEOUT_SECONDS,
+    )
+
+    parts: List[tuple] = []
+    for line in list_path.read_text(encoding="utf-8").splitlines():
+        name, start, _end = line.rsplit(",", 2)
+        parts.append((parts_dir / name, float(start)))
+    return parts
+
+
+def _transcribe_with_whisper(audio_path: Path) -> List[TranscriptSegment]:
+    """Transcribe audio via OpenAI Whisper API and return normalised segments.
+
+    Uses `response_format="verbose_json"` so we can preserve timestamps.
+    """
+
+    client = _get_openai_client()
+    suffix = audio_path.suffix.lower()
+    content_type = _AUDIO_CONTENT_TYPES.get(suffix, f"audio/{suffix.lstrip('.') or 'mpeg'}")
+
+    # Passing (name, file, content_type) rather than the bare file object sets
+    # the upload's filename and MIME type explicitly.
+    with _WHISPER_SEM, audio_path.open("rb") as f:
         transcript = client.audio.transcriptions.create(
-            model="whisper-1",
-            file=f,
+            model=WHISPER_MODEL,
+            file=(audio_path.name, f, content_type),
             response_format="verbose_json",
+            # Segment timestamps only; never the much larger per-word array.
+            timestamp_granularities=["segment"],
         )
 
-    data: Dict[str, Any]
-    if hasattr(transcript, "model_dump"):
-        data = transcript.model_dump()  # type: ignore[assignment]
-    else:
-        data = dict(transcript)  # type: ignore[arg-type]
-
-    raw_segments = data.get("segments")
-    if not isinstance(raw_segments, list) or not raw_segments:
+    # Read the SDK's segment objects directly rather than model_dump()-ing the
+    # whole response (which copies every segment and its unused fields).
+    raw_segments = getattr(transcript, "segments", None)
+    if not raw_segments:
         raise RuntimeError("Whisper transcription returned no segments.")
 
     segments: List[TranscriptSegment] = []
     for seg in raw_segments:
-        if not isinstance(seg, dict):
-            continue
-        text = str(seg.get("text", "")).strip()
-        start = float(seg.get("start", 0.0))
-        end = float(seg.get("end", start))
-        duration = max(0.0, end - start)
+        text = (seg.text or "").strip()
         if not text:
             continue
-        segments.append({"text": text, "start": start, "duration": duration})
+        start = float(seg.start or 0.0)
+        end = float(seg.end if seg.end is not None else start)
+        segments.append({"text": text, "start": start, "duration": max(0.0, end - start)})
 
     if not segments:
         raise RuntimeError("Whisper transcription returned segments but none had usable text.")